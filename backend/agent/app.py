@@ -13,6 +13,7 @@ from agno.tools.mcp import MCPTools
 from app.config import get_settings
 from app.logger import get_logger
 
+from . import prompts
 from .mongo import build_mongo_db
 
 from .tools import frontend_actions
@@ -33,30 +34,23 @@ def build_agents(db) -> List[Agent]:
     tool_name_prefix="eco",
   )
 
+  frontend_tools = [
+    prompts.stabilize_tool_schema(frontend_actions.render_widget),
+    prompts.stabilize_tool_schema(frontend_actions.request_confirmation),
+  ]
+  logger.info(
+    "Static prompt prefix: ~%d tokens, estimated (description, instructions, frontend tool schemas)",
+    prompts.count_tokens(prompts.static_prefix(frontend_tools)),
+  )
+
   eco_agent = Agent(
     name="Eco Assist Relationship Manager",
-    description="Helps EcoCash customers with balances, transactions, and support tickets.",
-    instructions=(
-      "1. Use the eco_* MCP tools to retrieve accurate balances, transactions, and tickets.\n"
-      "2. Respond with a short conversational summary before or after rendering UI.\n"
-      "3. For any structured data, call the render_widget tool with a valid WidgetPayload "
-      "(balance_card, transaction_table, ticket_form, confirmation_dialog, ticket_status_board).\n"
-      "4. If an action is sensitive or requires user confirmation, call request_confirmation with "
-      "a summary before executing the MCP mutation.\n"
-      "5. Always keep widget payloads schema-compliant and include deeplinks/postback payloads "
-      "to blend tap and text interactions.\n"
-      "6. When showing a transaction_table, include an `actions` array that contains at least one "
-      "button labeled \"Get help\" (action=postback, payload {\"type\":\"transaction_help\",\"transactionId\":\"<txn_id>\"}).\n"
-      "7. When the user taps or asks for help on a transaction, render a confirmation/summary widget that "
-      "highlights merchant, amount, time, and offer tap-able options such as \"Amount debited\", "
-      "\"Issue with offer\", \"Refund issues\" similar to the provided UX reference."
-    ),
+    description=prompts.AGENT_DESCRIPTION,
+    instructions=prompts.build_instructions,
+    # Dynamic values are rendered explicitly; skip template substitution on the static block.
+    resolve_in_context=False,
     model=OpenAIChat(id=settings.agno_model_id),
-    tools=[
-      mcp_tools,
-      frontend_actions.render_widget,
-      frontend_actions.request_confirmation,
-    ],
+    tools=[mcp_tools, *frontend_tools],
     store_events=True,
     db=db,
   )
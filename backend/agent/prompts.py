@@ -0,0 +1,97 @@
+"""
+Prompt + tool-schema assembly for the Eco Assist agent.
+
+Everything that is identical across requests (description, instructions and the
+frontend tool schemas) is serialized byte-for-byte the same way on every run and
+placed ahead of per-request context (user/session ids, dates). That keeps the
+request prefix cacheable by the model provider.
+"""
+
+import json
+from datetime import datetime, timezone
+from typing import Any, Iterable, Optional
+
+from agno.run.base import RunContext
+from agno.tools.function import Function
+
+from app.sessions import current_session
+
+AGENT_DESCRIPTION = "Helps EcoCash customers with balances, transactions, and support tickets."
+
+STATIC_INSTRUCTIONS = (
+  "1. Use the eco_* MCP tools to retrieve accurate balances, transactions, and tickets.\n"
+  "2. Respond with a short conversational summary before or after rendering UI.\n"
+  "3. For any structured data, call the render_widget tool with a valid WidgetPayload "
+  "(balance_card, transaction_table, ticket_form, confirmation_dialog, ticket_status_board).\n"
+  "4. If an action is sensitive or requires user confirmation, call request_confirmation with "
+  "a summary before executing the MCP mutation.\n"
+  "5. Always keep widget payloads schema-compliant and include deeplinks/postback payloads "
+  "to blend tap and text interactions.\n"
+  "6. When showing a transaction_table, include an `actions` array that contains at least one "
+  "button labeled \"Get help\" (action=postback, payload {\"type\":\"transaction_help\",\"transactionId\":\"<txn_id>\"}).\n"
+  "7. When the user taps or asks for help on a transaction, render a confirmation/summary widget that "
+  "highlights merchant, amount, time, and offer tap-able options such as \"Amount debited\", "
+  "\"Issue with offer\", \"Refund issues\" similar to the provided UX reference."
+)
+
+
+def canonical_json(value: Any) -> str:
+  return json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+def stabilize_tool_schema(function: Function) -> Function:
+  """
+  Resolve the tool's JSON schema once and pin it in canonical (key-sorted) form so
+  Agno sends the same bytes on every request instead of regenerating it per run.
+  """
+  if not function.skip_entrypoint_processing:
+    function.process_entrypoint()
+    function.parameters = json.loads(canonical_json(function.parameters))
+    function.skip_entrypoint_processing = True
+  return function
+
+
+def build_session_context(run_context: Optional[RunContext] = None, now: Optional[datetime] = None) -> str:
+  now = now or datetime.now(timezone.utc)
+  session = current_session.get()
+  user_id = run_context.user_id if run_context is not None else None
+  if not user_id and session is not None:
+    user_id = session.userId
+
+  lines = [f"- Current date (UTC): {now.date().isoformat()}"]
+  if user_id:
+    lines.append(f"- Customer user id: {user_id}")
+  if run_context is not None and run_context.session_id:
+    lines.append(f"- Session id: {run_context.session_id}")
+  if session is not None and session.preferences:
+    lines.append(f"- Customer preferences: {canonical_json(session.preferences)}")
+  return "<session_context>\n" + "\n".join(lines) + "\n</session_context>"
+
+
+def build_instructions(run_context: Optional[RunContext] = None) -> str:
+  """
+  Agno instructions callable: static block first, per-request context last.
+  """
+  return f"{STATIC_INSTRUCTIONS}\n\n{build_session_context(run_context)}"
+
+
+def static_prefix(tools: Iterable[Function]) -> str:
+  schemas = [
+    {"name": tool.name, "description": tool.description, "parameters": tool.parameters}
+    for tool in tools
+  ]
+  return f"{canonical_json(schemas)}\n{AGENT_DESCRIPTION}\n<instructions>\n{STATIC_INSTRUCTIONS}"
+
+
+def count_tokens(text: str) -> int:
+  """
+  Estimate the token count for startup logging. Uses tiktoken when it is
+  installed and its encoding can be loaded (first use downloads it), otherwise
+  a rough chars/4 heuristic for English/JSON text. Never raises.
+  """
+  try:
+    import tiktoken
+
+    return len(tiktoken.get_encoding("o200k_base").encode(text))
+  except Exception:
+    return (len(text) + 3) // 4
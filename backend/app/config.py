@@ -30,6 +30,10 @@ class Settings(BaseSettings):
 
   use_in_memory_db: bool = False
 
+  session_cache_size: int = 1024
+  session_ttl_minutes: int = 30
+  session_miss_ttl_seconds: int = 30
+
 
 @lru_cache
 def get_settings() -> Settings:
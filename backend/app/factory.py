@@ -6,6 +6,7 @@ from agent.mongo import build_mongo_db
 
 from .config import get_settings
 from .middleware import register_mobile_token_middleware
+from .sessions import register_session_routes
 
 
 def create_app() -> FastAPI:
@@ -25,6 +26,7 @@ def create_app() -> FastAPI:
   )
 
   register_mobile_token_middleware(base_app)
+  register_session_routes(base_app)
 
   agent_os = build_agent_os(base_app=base_app, db=build_mongo_db())
   return agent_os.get_app()
@@ -2,14 +2,28 @@ from typing import Optional
 
 from fastapi import Request
 from fastapi.responses import Response
+from pymongo.errors import PyMongoError
+from starlette.concurrency import run_in_threadpool
 from starlette.middleware.base import BaseHTTPMiddleware
 
+from .logger import get_logger
+from .schemas import SessionContext
+from .sessions import current_session, get_session_service
+
+logger = get_logger(__name__)
+
 
 class MobileTokenMiddleware(BaseHTTPMiddleware):
   """
   Captures the mobile JWT from the Authorization header and stores it on
   request.state so the agent (and downstream MCP calls) can forward it.
   No validation or signature checks are performed.
+
+  Tokens bootstrapped via `/session/start` are also resolved to their session
+  (served from the in-process cache on repeat turns) and exposed as
+  request.state.session and the `current_session` context variable, which the
+  agent's session-context prompt block reads (Agno's AG-UI router only takes
+  user_id from forwarded_props, not from request state).
   """
 
   def __init__(self, app, header_key: str = "Authorization"):
@@ -25,14 +39,31 @@ class MobileTokenMiddleware(BaseHTTPMiddleware):
       return parts[1].strip()
     return auth.strip()
 
+  async def _resolve_session(self, token: str) -> Optional[SessionContext]:
+    try:
+      service = get_session_service()
+      session = service.cached(token)
+      if session is not None or service.known_miss(token):
+        return session
+      return await run_in_threadpool(service.resolve, token)
+    except PyMongoError as exc:
+      logger.warning("Session lookup failed; continuing without session context. %s", exc)
+      return None
+
   async def dispatch(self, request: Request, call_next):
     token = self._extract_token(request)
     request.state.mobile_token = token
+    request.state.session = None
     if token:
       deps = getattr(request.state, "dependencies", {}) or {}
       deps["mobile_token"] = token
       request.state.dependencies = deps
-    response: Response = await call_next(request)
+      request.state.session = await self._resolve_session(token)
+    reset_token = current_session.set(request.state.session)
+    try:
+      response: Response = await call_next(request)
+    finally:
+      current_session.reset(reset_token)
     return response
 
 
@@ -17,3 +17,9 @@ class SessionResponse(BaseModel):
   class Config:
     populate_by_name = True
 
+
+class SessionContext(BaseModel):
+  sessionId: str
+  userId: str
+  expiresAt: datetime
+  preferences: Dict[str, Any] = Field(default_factory=dict)
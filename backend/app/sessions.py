@@ -0,0 +1,268 @@
+import hashlib
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextvars import ContextVar
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+import jwt
+from fastapi import APIRouter, HTTPException
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from .config import get_settings
+from .database import get_db
+from .logger import get_logger
+from .schemas import SessionContext, SessionResponse, SessionStartRequest
+
+logger = get_logger(__name__)
+
+SESSIONS_COLLECTION = "sessions"
+
+# Session resolved by MobileTokenMiddleware for the request currently being served.
+current_session: ContextVar[Optional[SessionContext]] = ContextVar("current_session", default=None)
+
+
+def hash_token(token: str) -> str:
+  return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def _utcnow() -> datetime:
+  return datetime.now(timezone.utc)
+
+
+def _as_utc(value: datetime) -> datetime:
+  # Mongo hands back naive datetimes (UTC) unless the client is tz_aware.
+  return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def _read_claims(token: str) -> Dict[str, Any]:
+  # JWT passthrough (decision #1): claims are read, not verified.
+  try:
+    return jwt.decode(token, options={"verify_signature": False})
+  except jwt.PyJWTError:
+    return {}
+
+
+def _to_context(doc: Dict[str, Any]) -> SessionContext:
+  return SessionContext(
+    sessionId=doc["sessionId"],
+    userId=doc["userId"],
+    expiresAt=_as_utc(doc["expiresAt"]),
+    preferences=doc.get("preferences") or {},
+  )
+
+
+class SessionCache:
+  """
+  Thread-safe LRU of active sessions keyed by token hash. Expired entries are
+  dropped on read so callers never see a stale session.
+  """
+
+  def __init__(self, maxsize: int = 1024):
+    self.maxsize = maxsize
+    self._items: "OrderedDict[str, SessionContext]" = OrderedDict()
+    self._lock = threading.Lock()
+
+  def get(self, token_hash: str, now: Optional[datetime] = None) -> Optional[SessionContext]:
+    now = now or _utcnow()
+    with self._lock:
+      session = self._items.get(token_hash)
+      if session is None:
+        return None
+      if session.expiresAt <= now:
+        del self._items[token_hash]
+        return None
+      self._items.move_to_end(token_hash)
+      return session
+
+  def put(self, token_hash: str, session: SessionContext) -> None:
+    with self._lock:
+      self._items[token_hash] = session
+      self._items.move_to_end(token_hash)
+      while len(self._items) > self.maxsize:
+        self._items.popitem(last=False)
+
+  def __len__(self) -> int:
+    return len(self._items)
+
+
+class MissCache:
+  """
+  Short-lived, bounded set of token hashes with no session, so unknown tokens
+  don't trigger a store lookup on every request.
+  """
+
+  def __init__(self, ttl_seconds: float = 30, maxsize: int = 1024):
+    self.ttl_seconds = ttl_seconds
+    self.maxsize = maxsize
+    self._items: "OrderedDict[str, float]" = OrderedDict()
+    self._lock = threading.Lock()
+
+  def __contains__(self, token_hash: str) -> bool:
+    with self._lock:
+      expires = self._items.get(token_hash)
+      if expires is None:
+        return False
+      if expires <= time.monotonic():
+        del self._items[token_hash]
+        return False
+      return True
+
+  def add(self, token_hash: str) -> None:
+    with self._lock:
+      self._items[token_hash] = time.monotonic() + self.ttl_seconds
+      self._items.move_to_end(token_hash)
+      while len(self._items) > self.maxsize:
+        self._items.popitem(last=False)
+
+  def discard(self, token_hash: str) -> None:
+    with self._lock:
+      self._items.pop(token_hash, None)
+
+
+class SessionExpiredError(ValueError):
+  pass
+
+
+class MongoSessionStore:
+  def __init__(self, collection):
+    self.collection = collection
+    # Unique tokenHash keeps concurrent upserts for one token on a single document;
+    # the TTL index lets Mongo purge sessions once expiresAt has passed.
+    self.collection.create_index("tokenHash", unique=True)
+    self.collection.create_index("expiresAt", expireAfterSeconds=0)
+
+  def find(self, token_hash: str) -> Optional[Dict[str, Any]]:
+    return self.collection.find_one({"tokenHash": token_hash})
+
+  def upsert(self, token_hash: str, fields: Dict[str, Any], on_insert: Dict[str, Any]) -> Dict[str, Any]:
+    query = {"tokenHash": token_hash}
+    update = {"$set": fields, "$setOnInsert": on_insert}
+    try:
+      return self.collection.find_one_and_update(query, update, upsert=True, return_document=ReturnDocument.AFTER)
+    except DuplicateKeyError:
+      # Lost the insert race to a concurrent start for the same token; the retry updates its document.
+      return self.collection.find_one_and_update(query, update, return_document=ReturnDocument.AFTER)
+
+
+class InMemorySessionStore:
+  def __init__(self):
+    self._docs: Dict[str, Dict[str, Any]] = {}
+    self._lock = threading.Lock()
+
+  def find(self, token_hash: str) -> Optional[Dict[str, Any]]:
+    doc = self._docs.get(token_hash)
+    return dict(doc) if doc else None
+
+  def upsert(self, token_hash: str, fields: Dict[str, Any], on_insert: Dict[str, Any]) -> Dict[str, Any]:
+    with self._lock:
+      doc = self._docs.get(token_hash)
+      if doc is None:
+        doc = {"tokenHash": token_hash, **on_insert}
+        self._docs[token_hash] = doc
+      doc.update(fields)
+      return dict(doc)
+
+
+def build_session_store():
+  settings = get_settings()
+  if getattr(settings, "use_in_memory_db", False):
+    return InMemorySessionStore()
+  return MongoSessionStore(get_db()[SESSIONS_COLLECTION])
+
+
+class SessionService:
+  def __init__(self, store, cache: SessionCache, ttl: timedelta, misses: Optional[MissCache] = None):
+    self.store = store
+    self.cache = cache
+    self.ttl = ttl
+    self.misses = misses or MissCache()
+
+  def start(self, request: SessionStartRequest) -> SessionContext:
+    """
+    Start or resume the session bound to a mobile token. The same token always
+    maps to the same sessionId; user, expiry and preferences are refreshed.
+    """
+    now = _utcnow()
+    metadata = request.metadata or {}
+    claims = _read_claims(request.mobileToken)
+
+    user_id = claims.get("sub") or metadata.get("userId") or "eco-user"
+    exp = claims.get("exp")
+    expires_at = datetime.fromtimestamp(exp, timezone.utc) if isinstance(exp, (int, float)) else now + self.ttl
+    if expires_at <= now:
+      raise SessionExpiredError("Mobile token has expired")
+
+    token_hash = hash_token(request.mobileToken)
+    doc = self.store.upsert(
+      token_hash,
+      fields={
+        "userId": str(user_id),
+        "expiresAt": expires_at,
+        "metadata": metadata,
+        "preferences": metadata.get("preferences") or {},
+        "updatedAt": now,
+      },
+      on_insert={"sessionId": f"sess_{uuid.uuid4().hex}", "createdAt": now},
+    )
+    session = _to_context(doc)
+    self.misses.discard(token_hash)
+    self.cache.put(token_hash, session)
+    return session
+
+  def cached(self, token: str) -> Optional[SessionContext]:
+    return self.cache.get(hash_token(token))
+
+  def known_miss(self, token: str) -> bool:
+    return hash_token(token) in self.misses
+
+  def resolve(self, token: str) -> Optional[SessionContext]:
+    """
+    Look up an active session, hitting the store only on a cache miss. Tokens
+    without a live session are remembered briefly so repeats skip the store.
+    """
+    token_hash = hash_token(token)
+    session = self.cache.get(token_hash)
+    if session is not None:
+      return session
+    if token_hash in self.misses:
+      return None
+    doc = self.store.find(token_hash)
+    session = _to_context(doc) if doc is not None else None
+    if session is None or session.expiresAt <= _utcnow():
+      self.misses.add(token_hash)
+      return None
+    self.cache.put(token_hash, session)
+    return session
+
+
+@lru_cache
+def get_session_service() -> SessionService:
+  settings = get_settings()
+  return SessionService(
+    store=build_session_store(),
+    cache=SessionCache(maxsize=settings.session_cache_size),
+    ttl=timedelta(minutes=settings.session_ttl_minutes),
+    misses=MissCache(ttl_seconds=settings.session_miss_ttl_seconds, maxsize=settings.session_cache_size),
+  )
+
+
+router = APIRouter(tags=["Session"])
+
+
+@router.post("/session/start", response_model=SessionResponse)
+def start_session(body: SessionStartRequest) -> SessionResponse:
+  try:
+    session = get_session_service().start(body)
+  except SessionExpiredError as exc:
+    raise HTTPException(status_code=401, detail=str(exc)) from exc
+  logger.info("Session %s ready for user %s", session.sessionId, session.userId)
+  return SessionResponse(sessionId=session.sessionId, userId=session.userId, expiresAt=session.expiresAt)
+
+
+def register_session_routes(app):
+  app.include_router(router)
@@ -4,16 +4,29 @@ FastMCP v2 server that exposes mock wallet + ticket tools for Eco Assist.
 This server can be launched via STDIO (default) so Agno's MCPTools can connect
 using the `command` parameter. It returns deterministic dummy data that mirrors
 the structures the real wallet/ticket MCP will provide later.
+
+Set ECO_MCP_SYNTHETIC=1 to swap the hardcoded fixtures for a seeded synthetic
+dataset sized for load/perf testing (see `SyntheticConfig` for the knobs).
+Per-user ledgers are generated lazily into compact column arrays and kept in a
+bounded LRU; generation is deterministic, so evicted users regenerate identically.
 """
 
 from __future__ import annotations
 
 import asyncio
-from datetime import datetime, timedelta
+import copy
+import os
+import random
+import zlib
+from array import array
+from collections import OrderedDict
+from itertools import accumulate, count
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, Awaitable, Callable, Iterable, Literal, NamedTuple, get_args
 
 from fastmcp import FastMCP
+from fastmcp.exceptions import ToolError
 
 
 server = FastMCP(
@@ -92,41 +105,625 @@ TICKETS: dict[str, dict[str, Any]] = {
 }
 
 
+TransactionStatus = Literal["completed", "pending", "failed"]
+TransactionCategory = Literal["merchant_payment", "topup", "p2p", "bill_payment", "airtime", "cash_out"]
+TransactionDirection = Literal["inflow", "outflow"]
+
+TXN_STATUSES: tuple[str, ...] = get_args(TransactionStatus)
+TXN_CATEGORIES: tuple[str, ...] = get_args(TransactionCategory)
+TXN_DIRECTIONS: tuple[str, ...] = get_args(TransactionDirection)
+INFLOW_CATEGORIES = frozenset({"topup"})
+CURRENCIES = ("USD", "ZWL")
+TicketStatus = Literal["new", "in_progress", "pending_customer", "resolved", "closed"]
+TICKET_STATUSES: tuple[str, ...] = get_args(TicketStatus)
+HISTORY_SECONDS = 365 * 86400
+AMOUNT_POOL_SIZE = 4096
+MERCHANTS = ("OK Mart", "TM Pick n Pay", "Spar", "Choppies", "Bon Marche", "Zimra", "ZESA", "Econet Airtime")
+
+
+class SyntheticConfig(NamedTuple):
+  """
+  Synthetic dataset sizing, read from ECO_MCP_SYNTHETIC_* env vars. Any user id
+  gets a ledger on first access; `users` bounds the ids (syn-000000...) built
+  up front when `preload` is set.
+
+  Cached ledgers are evicted LRU once either `max_cached_users` or
+  `max_cached_rows` is exceeded (the most recent ledger is always kept). At ~19
+  bytes per row the default row cap holds memory to roughly 100 MB; a single
+  ledger larger than the cap still gets built, so size transactions_per_user
+  accordingly.
+  """
+
+  users: int = 1_000
+  transactions_per_user: int = 1_000
+  tickets_per_user: int = 3
+  seed: int = 42
+  max_cached_users: int = 256
+  max_cached_rows: int = 5_000_000
+  preload: bool = False
+
+  @classmethod
+  def from_env(cls) -> SyntheticConfig | None:
+    if os.environ.get("ECO_MCP_SYNTHETIC", "").lower() not in {"1", "true", "yes"}:
+      return None
+    env = os.environ.get
+    defaults = cls._field_defaults
+    return cls(
+      users=int(env("ECO_MCP_SYNTHETIC_USERS", defaults["users"])),
+      transactions_per_user=int(env("ECO_MCP_SYNTHETIC_TXNS_PER_USER", defaults["transactions_per_user"])),
+      tickets_per_user=int(env("ECO_MCP_SYNTHETIC_TICKETS_PER_USER", defaults["tickets_per_user"])),
+      seed=int(env("ECO_MCP_SYNTHETIC_SEED", defaults["seed"])),
+      max_cached_users=int(env("ECO_MCP_SYNTHETIC_MAX_CACHED_USERS", defaults["max_cached_users"])),
+      max_cached_rows=int(env("ECO_MCP_SYNTHETIC_MAX_CACHED_ROWS", defaults["max_cached_rows"])),
+      preload=env("ECO_MCP_SYNTHETIC_PRELOAD", "").lower() in {"1", "true", "yes"},
+    )
+
+
+def synthetic_user_id(index: int) -> str:
+  return f"syn-{index:06d}"
+
+
+class SyntheticLedger:
+  """
+  Column-oriented transactions for one user, newest first.
+
+  Rows cost ~19 bytes (timestamp, amount, three 1-byte codes); ids, deeplinks and
+  descriptions are derived from the row index instead of being stored.
+  """
+
+  __slots__ = (
+    "user_id",
+    "posted_at",
+    "amount",
+    "status",
+    "category",
+    "currency",
+    "balances",
+  )
+
+  def __init__(self, user_id: str, config: SyntheticConfig, anchor: int):
+    self.user_id = user_id
+    rng = random.Random(zlib.crc32(user_id.encode("utf-8")) ^ config.seed)
+    n = config.transactions_per_user
+
+    self.status = array("B", rng.choices(range(len(TXN_STATUSES)), weights=(90, 7, 3), k=n))
+    self.category = array("B", rng.choices(range(len(TXN_CATEGORIES)), weights=(40, 15, 20, 10, 10, 5), k=n))
+    self.currency = array("B", rng.choices(range(len(CURRENCIES)), weights=(85, 15), k=n))
+
+    # Spread the history over roughly a year regardless of size; rows stay newest first.
+    mean_gap = max(1, HISTORY_SECONDS // max(n, 1))
+    gaps = rng.choices(range(1, 2 * mean_gap + 1), k=n)
+    self.posted_at = array("q", (anchor - offset for offset in accumulate(gaps)))
+
+    # Sampling from a small pre-drawn pool keeps generation O(n) in C-level calls.
+    pool = [round(rng.lognormvariate(3, 1), 2) for _ in range(max(1, min(AMOUNT_POOL_SIZE, n)))]
+    inflow = {TXN_CATEGORIES.index(name) for name in INFLOW_CATEGORIES}
+    self.amount = array(
+      "d",
+      (value if code in inflow else -value for value, code in zip(rng.choices(pool, k=n), self.category)),
+    )
+
+    self.balances = array("d", (round(rng.uniform(50, 5000), 2) for _ in CURRENCIES))
+
+  def __len__(self) -> int:
+    return len(self.posted_at)
+
+  def _txn_id(self, i: int) -> str:
+    return synthetic_txn_id(self.user_id, i)
+
+  def transaction(self, i: int) -> dict[str, Any]:
+    category = TXN_CATEGORIES[self.category[i]]
+    if category == "merchant_payment":
+      description = f"Merchant payment - {MERCHANTS[i % len(MERCHANTS)]}"
+    elif category == "p2p":
+      description = f"P2P transfer to +263771{i % 1_000_000:06d}"
+    else:
+      description = category.replace("_", " ").capitalize()
+    txn_id = self._txn_id(i)
+    return {
+      "id": txn_id,
+      "description": description,
+      "amount": self.amount[i],
+      "currency": CURRENCIES[self.currency[i]],
+      "status": TXN_STATUSES[self.status[i]],
+      "category": category,
+      "deeplink": f"ecocash://transactions/{txn_id}",
+      "posted_at": datetime.fromtimestamp(self.posted_at[i], timezone.utc).isoformat(),
+    }
+
+  def select(
+    self,
+    offset: int,
+    limit: int,
+    status: TransactionStatus | None = None,
+    category: TransactionCategory | None = None,
+    direction: TransactionDirection | None = None,
+  ) -> tuple[list[dict[str, Any]], int | None]:
+    """
+    Scan the code columns from `offset`; only matching rows are materialized.
+    Filter values are expected to be validated by `_check_transaction_filters`.
+    """
+    status_code = TXN_STATUSES.index(status) if status is not None else None
+    category_code = TXN_CATEGORIES.index(category) if category is not None else None
+
+    rows: list[dict[str, Any]] = []
+    i, n = offset, len(self)
+    while i < n and len(rows) < limit:
+      if (
+        (status_code is None or self.status[i] == status_code)
+        and (category_code is None or self.category[i] == category_code)
+        and (direction is None or (self.amount[i] >= 0) == (direction == "inflow"))
+      ):
+        rows.append(self.transaction(i))
+      i += 1
+    return rows, (i if i < n else None)
+
+  def accounts(self) -> list[dict[str, Any]]:
+    """Fixture-shaped wallet accounts with this ledger's balances (built per call, not stored)."""
+    accounts = []
+    for template, balance in zip(BASE_BALANCES["retail-123"], self.balances):
+      accounts.append({**template, "balance": balance, "available": round(balance * 0.9, 2)})
+    return accounts
+
+
+def synthetic_txn_id(user_id: str, index: int) -> str:
+  return f"txn-{user_id}-{index:07d}"
+
+
+def synthetic_tickets(user_id: str, config: SyntheticConfig, anchor: int) -> list[dict[str, Any]]:
+  """
+  Generated baseline tickets for a user. They use their own seed, so listing
+  tickets is O(tickets_per_user) and never builds the transaction ledger.
+  """
+  rng = random.Random(zlib.crc32(f"tickets:{user_id}".encode("utf-8")) ^ config.seed)
+  n = config.transactions_per_user
+  tickets = []
+  for j in range(config.tickets_per_user):
+    txn_id = synthetic_txn_id(user_id, rng.randrange(n)) if n else None
+    tickets.append(
+      {
+        "id": f"TCK-{user_id}-{j:04d}",
+        "user_id": user_id,
+        "status": rng.choice(TICKET_STATUSES),
+        "summary": f"Query about {txn_id}" if txn_id else "General query",
+        "transaction_id": txn_id,
+        "last_update": datetime.fromtimestamp(anchor - rng.randrange(30 * 86400), timezone.utc).isoformat(),
+        "version": 1,
+      }
+    )
+  return tickets
+
+
+def _synthetic_ticket(ticket_id: str) -> dict[str, Any] | None:
+  # Synthetic ids are TCK-<user_id>-<nnnn>; workflow-created ids (TCK-1002) have no user part.
+  if SYNTHETIC is None or not ticket_id.startswith("TCK-"):
+    return None
+  user_id, sep, index = ticket_id[len("TCK-"):].rpartition("-")
+  if not (sep and user_id and len(index) == 4 and index.isdigit()):
+    return None
+  if int(index) >= SYNTHETIC.tickets_per_user:
+    return None
+  return synthetic_tickets(user_id, SYNTHETIC, _SYNTHETIC_ANCHOR)[int(index)]
+
+
+SYNTHETIC: SyntheticConfig | None = None
+_SYNTHETIC_ANCHOR = 0
+_LEDGERS: OrderedDict[str, SyntheticLedger] = OrderedDict()
+_cached_rows = 0
+
+
+def configure_synthetic(config: SyntheticConfig | None) -> None:
+  """Switch the server into (or out of) synthetic mode, dropping cached ledgers."""
+  global SYNTHETIC, _SYNTHETIC_ANCHOR, _cached_rows
+  SYNTHETIC = config
+  # Anchor timestamps to the start of the day so reruns produce identical rows.
+  _SYNTHETIC_ANCHOR = int(datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0).timestamp())
+  _LEDGERS.clear()
+  _cached_rows = 0
+  WORKFLOW.forget_adopted()
+  if config is not None and config.preload:
+    for index in range(min(config.users, config.max_cached_users)):
+      _ledger(synthetic_user_id(index))
+
+
+def _ledger(user_id: str) -> SyntheticLedger:
+  global _cached_rows
+  assert SYNTHETIC is not None
+  ledger = _LEDGERS.get(user_id)
+  if ledger is None:
+    ledger = SyntheticLedger(user_id, SYNTHETIC, _SYNTHETIC_ANCHOR)
+    _LEDGERS[user_id] = ledger
+    _cached_rows += len(ledger)
+    while len(_LEDGERS) > 1 and (
+      len(_LEDGERS) > SYNTHETIC.max_cached_users or _cached_rows > SYNTHETIC.max_cached_rows
+    ):
+      _, evicted = _LEDGERS.popitem(last=False)
+      _cached_rows -= len(evicted)
+  else:
+    _LEDGERS.move_to_end(user_id)
+  return ledger
+
+
 def _ensure_user(user_id: str):
-  BASE_BALANCES.setdefault(user_id, BASE_BALANCES["retail-123"])
-  BASE_TRANSACTIONS.setdefault(user_id, BASE_TRANSACTIONS["retail-123"])
+  # Fixture mode only: copy the template so per-user mutations never leak into other users.
+  if user_id not in BASE_BALANCES:
+    BASE_BALANCES[user_id] = copy.deepcopy(BASE_BALANCES["retail-123"])
+  if user_id not in BASE_TRANSACTIONS:
+    BASE_TRANSACTIONS[user_id] = copy.deepcopy(BASE_TRANSACTIONS["retail-123"])
+
+
+def _parse_cursor(cursor: str | None) -> int:
+  if not cursor:
+    return 0
+  try:
+    offset = int(cursor)
+  except ValueError:
+    raise ToolError(f"Invalid cursor {cursor!r}; pass next_cursor from a previous page") from None
+  if offset < 0:
+    raise ToolError(f"Invalid cursor {cursor!r}; must be a non-negative offset")
+  return offset
+
+
+def _check_transaction_filters(status: str | None, category: str | None, direction: str | None) -> None:
+  # The MCP schema already restricts these; direct callers get the same contract in both modes.
+  for name, value, allowed in (
+    ("status", status, TXN_STATUSES),
+    ("category", category, TXN_CATEGORIES),
+    ("direction", direction, TXN_DIRECTIONS),
+  ):
+    if value is not None and value not in allowed:
+      raise ToolError(f"Unknown {name} {value!r}; expected one of {', '.join(allowed)}")
+
+
+def _page(
+  rows: Iterable[dict[str, Any]], offset: int, limit: int, predicate: Callable[[dict[str, Any]], bool]
+) -> tuple[list[dict[str, Any]], int | None]:
+  rows = list(rows)
+  matched: list[dict[str, Any]] = []
+  i = offset
+  while i < len(rows) and len(matched) < limit:
+    if predicate(rows[i]):
+      matched.append(rows[i])
+    i += 1
+  return matched, (i if i < len(rows) else None)
+
+
+# Allowed ticket status moves; mirrors TicketStatusItem.status in agent/widgets.py.
+TICKET_TRANSITIONS: dict[str, frozenset[str]] = {
+  "new": frozenset({"in_progress", "closed"}),
+  "in_progress": frozenset({"pending_customer", "resolved"}),
+  "pending_customer": frozenset({"in_progress", "resolved"}),
+  "resolved": frozenset({"closed", "in_progress"}),
+  "closed": frozenset(),
+}
+
+
+class TicketWorkflowError(ToolError):
+  def __init__(self, code: str, message: str):
+    super().__init__(f"{code}: {message}")
+    self.code = code
+
+
+class TicketWorkflow:
+  """
+  Ticket store + state machine safe under concurrent tool calls.
+
+  - ids come from a monotonic counter, never from len(tickets)
+  - every mutation of a ticket runs under that ticket's lock and bumps `version`;
+    callers may pass `expected_version` for optimistic concurrency
+  - `idempotency_key` makes create/update retries return the original result;
+    reusing a key with different arguments is rejected (`idempotency_mismatch`).
+    Only the most recent `max_idempotency_keys` results are kept.
+  - each change is appended to `events` (never rewritten) and forwarded to the
+    optional async `sink`, which is awaited while the ticket lock is held
+  - tickets the store doesn't hold are looked up through the optional `resolver`
+    (synthetic data). They are only copied in once a transition changes them, and
+    at most `max_adopted` of those are kept, least recently changed dropped first.
+  """
+
+  def __init__(
+    self,
+    tickets: dict[str, dict[str, Any]] | None = None,
+    sink: Callable[[dict[str, Any]], Awaitable[None]] | None = None,
+    max_idempotency_keys: int = 10_000,
+    resolver: Callable[[str], dict[str, Any] | None] | None = None,
+    max_adopted: int = 100_000,
+  ):
+    self.tickets: dict[str, dict[str, Any]] = tickets if tickets is not None else {}
+    self.events: list[dict[str, Any]] = []
+    self.sink = sink
+    self.resolver = resolver
+    self._ids = count(1001 + len(self.tickets))
+    self._seq = count(1)
+    self._locks: dict[str, asyncio.Lock] = {}
+    self._pending: dict[str, asyncio.Future] = {}
+    self._results: OrderedDict[str, tuple[tuple[Any, ...], dict[str, Any]]] = OrderedDict()
+    self.max_idempotency_keys = max_idempotency_keys
+    self._by_user: dict[str, list[str]] = {}
+    self._history: dict[str, list[dict[str, Any]]] = {}
+    self._adopted: OrderedDict[str, None] = OrderedDict()
+    self.max_adopted = max_adopted
+    for ticket in list(self.tickets.values()):
+      ticket.setdefault("version", 1)
+      self._store(ticket)
+      self._log(ticket, "created", None)
+
+  def _lock(self, ticket_id: str) -> asyncio.Lock:
+    return self._locks.setdefault(ticket_id, asyncio.Lock())
+
+  def _recall(self, key: str, fingerprint: tuple[Any, ...]) -> dict[str, Any] | None:
+    entry = self._results.get(key)
+    if entry is None:
+      return None
+    if entry[0] != fingerprint:
+      raise TicketWorkflowError("idempotency_mismatch", f"Idempotency key {key} was used with different arguments")
+    return dict(entry[1])
+
+  def _remember(self, key: str, fingerprint: tuple[Any, ...], result: dict[str, Any]) -> None:
+    self._results[key] = (fingerprint, dict(result))
+    while len(self._results) > self.max_idempotency_keys:
+      self._results.popitem(last=False)
+
+  def _store(self, ticket: dict[str, Any]) -> None:
+    self.tickets[ticket["id"]] = ticket
+    self._by_user.setdefault(ticket["user_id"], []).append(ticket["id"])
+
+  def _drop(self, ticket_id: str) -> None:
+    ticket = self.tickets.pop(ticket_id)
+    owned = self._by_user[ticket["user_id"]]
+    owned.remove(ticket_id)
+    if not owned:
+      del self._by_user[ticket["user_id"]]
+    self._history.pop(ticket_id, None)
+    self._locks.pop(ticket_id, None)
+
+  def _adopt(self, ticket: dict[str, Any]) -> None:
+    self._store(ticket)
+    self._adopted[ticket["id"]] = None
+    # Locked tickets have a transition in flight; leave them for a later pass.
+    for ticket_id in list(self._adopted)[: max(len(self._adopted) - self.max_adopted, 0)]:
+      lock = self._locks.get(ticket_id)
+      if lock is None or not lock.locked():
+        del self._adopted[ticket_id]
+        self._drop(ticket_id)
+
+  def forget_adopted(self) -> None:
+    """Drop every ticket copied in from the resolver (e.g. when synthetic data is reconfigured)."""
+    while self._adopted:
+      self._drop(self._adopted.popitem(last=False)[0])
+
+  def _resolve(self, ticket_id: str) -> dict[str, Any] | None:
+    ticket = self.tickets.get(ticket_id)
+    if ticket is None and self.resolver is not None:
+      ticket = self.resolver(ticket_id)
+    return ticket
+
+  def _event(self, ticket: dict[str, Any], kind: str, from_status: str | None, note: str | None, seq: int) -> dict[str, Any]:
+    return {
+      "seq": seq,
+      "ticket_id": ticket["id"],
+      "type": kind,
+      "from_status": from_status,
+      "to_status": ticket["status"],
+      "version": ticket["version"],
+      "note": note,
+      "at": ticket["last_update"],
+    }
+
+  def _log(self, ticket: dict[str, Any], kind: str, from_status: str | None, note: str | None = None) -> dict[str, Any]:
+    event = self._event(ticket, kind, from_status, note, next(self._seq))
+    self.events.append(event)
+    self._history.setdefault(ticket["id"], []).append(event)
+    return event
+
+  async def _emit(self, event: dict[str, Any]) -> None:
+    if self.sink is not None:
+      await self.sink(event)
+
+  def get(self, ticket_id: str) -> dict[str, Any]:
+    ticket = self._resolve(ticket_id)
+    if ticket is None:
+      raise TicketWorkflowError("not_found", f"Ticket {ticket_id} does not exist")
+    return dict(ticket)
+
+  def for_user(self, user_id: str) -> list[dict[str, Any]]:
+    return [dict(self.tickets[ticket_id]) for ticket_id in self._by_user.get(user_id, ())]
+
+  def history(self, ticket_id: str) -> list[dict[str, Any]]:
+    events = self._history.get(ticket_id)
+    if events is not None:
+      return [dict(event) for event in events]
+    ticket = self._resolve(ticket_id)
+    # An untouched resolver ticket has only its baseline; seq 0 marks it as not logged.
+    return [self._event(ticket, "created", None, None, 0)] if ticket is not None else []
+
+  async def create(
+    self,
+    user_id: str,
+    reason: str,
+    transaction_id: str | None = None,
+    idempotency_key: str | None = None,
+  ) -> dict[str, Any]:
+    if not idempotency_key:
+      return await self._create(user_id, reason, transaction_id)
+    key = f"create:{user_id}:{idempotency_key}"
+    fingerprint = (reason, transaction_id)
+    while True:
+      result = self._recall(key, fingerprint)
+      if result is not None:
+        return result
+      pending = self._pending.get(key)
+      if pending is None:
+        break
+      # Another call with this key is in flight; wait for it, then re-check.
+      await asyncio.wait([pending])
+
+    pending = asyncio.get_running_loop().create_future()
+    self._pending[key] = pending
+    try:
+      result = await self._create(user_id, reason, transaction_id)
+      self._remember(key, fingerprint, result)
+      return result
+    finally:
+      del self._pending[key]
+      pending.set_result(None)
+
+  async def _create(self, user_id: str, reason: str, transaction_id: str | None) -> dict[str, Any]:
+    ticket_id = f"TCK-{next(self._ids)}"
+    async with self._lock(ticket_id):
+      ticket = {
+        "id": ticket_id,
+        "user_id": user_id,
+        "status": "new",
+        "summary": reason,
+        "transaction_id": transaction_id,
+        "last_update": datetime.utcnow().isoformat(),
+        "version": 1,
+      }
+      self._store(ticket)
+      await self._emit(self._log(ticket, "created", None))
+      return dict(ticket)
+
+  async def transition(
+    self,
+    ticket_id: str,
+    status: str,
+    expected_version: int | None = None,
+    note: str | None = None,
+    idempotency_key: str | None = None,
+  ) -> dict[str, Any]:
+    key = f"update:{ticket_id}:{idempotency_key}" if idempotency_key else None
+    fingerprint = (status, expected_version, note)
+    async with self._lock(ticket_id):
+      if key is not None:
+        result = self._recall(key, fingerprint)
+        if result is not None:
+          return result
+      ticket = self._resolve(ticket_id)
+      if ticket is None:
+        raise TicketWorkflowError("not_found", f"Ticket {ticket_id} does not exist")
+      if expected_version is not None and expected_version != ticket["version"]:
+        raise TicketWorkflowError(
+          "version_conflict", f"Ticket {ticket_id} is at version {ticket['version']}, not {expected_version}"
+        )
+      current = ticket["status"]
+      if status not in TICKET_TRANSITIONS.get(current, frozenset()):
+        raise TicketWorkflowError("invalid_transition", f"Cannot move ticket {ticket_id} from {current} to {status}")
+
+      if ticket_id not in self.tickets:
+        # First change to a resolver ticket: keep a copy from here on, baseline first.
+        ticket = dict(ticket)
+        self._adopt(ticket)
+        self._log(ticket, "created", None)
+      elif ticket_id in self._adopted:
+        self._adopted.move_to_end(ticket_id)
+      ticket["status"] = status
+      ticket["version"] += 1
+      ticket["last_update"] = datetime.utcnow().isoformat()
+      await self._emit(self._log(ticket, "status_changed", current, note))
+      result = dict(ticket)
+      if key is not None:
+        self._remember(key, fingerprint, result)
+      return result
+
+
+WORKFLOW = TicketWorkflow(TICKETS, resolver=_synthetic_ticket)
 
 
 @server.tool(name="get_balances", description="Return wallet balances for a user.")
 async def get_balances(user_id: str) -> dict[str, Any]:
+  if SYNTHETIC is not None:
+    return {"user_id": user_id, "accounts": _ledger(user_id).accounts()}
   _ensure_user(user_id)
   return {"user_id": user_id, "accounts": BASE_BALANCES[user_id]}
 
 
-@server.tool(name="get_transactions", description="Return last N transactions for a user.")
-async def get_transactions(user_id: str, limit: int = 5) -> dict[str, Any]:
-  _ensure_user(user_id)
-  return {"user_id": user_id, "transactions": BASE_TRANSACTIONS[user_id][:limit]}
-
-
-@server.tool(name="create_ticket", description="Create a mock support ticket.")
-async def create_ticket(user_id: str, reason: str, transaction_id: str | None = None) -> dict[str, Any]:
-  ticket_id = f"TCK-{len(TICKETS) + 1001}"
-  TICKETS[ticket_id] = {
-    "id": ticket_id,
+@server.tool(
+  name="get_transactions",
+  description=(
+    "Return transactions for a user, newest first. Optional filters: status, category, "
+    "direction (inflow/outflow). Pass the returned next_cursor to fetch the next page."
+  ),
+)
+async def get_transactions(
+  user_id: str,
+  limit: int = 5,
+  cursor: str | None = None,
+  status: TransactionStatus | None = None,
+  category: TransactionCategory | None = None,
+  direction: TransactionDirection | None = None,
+) -> dict[str, Any]:
+  _check_transaction_filters(status, category, direction)
+  offset = _parse_cursor(cursor)
+  if SYNTHETIC is not None:
+    rows, next_offset = _ledger(user_id).select(offset, limit, status, category, direction)
+  else:
+    _ensure_user(user_id)
+    rows, next_offset = _page(
+      BASE_TRANSACTIONS[user_id],
+      offset,
+      limit,
+      lambda txn: (
+        (status is None or txn["status"] == status)
+        and (category is None or txn["category"] == category)
+        and (direction is None or (txn["amount"] >= 0) == (direction == "inflow"))
+      ),
+    )
+  return {
     "user_id": user_id,
-    "status": "new",
-    "summary": reason,
-    "transaction_id": transaction_id,
-    "last_update": datetime.utcnow().isoformat(),
+    "transactions": rows,
+    "next_cursor": str(next_offset) if next_offset is not None else None,
   }
-  return TICKETS[ticket_id]
+
+
+@server.tool(
+  name="create_ticket",
+  description="Create a mock support ticket. Reuse idempotency_key when retrying to avoid duplicates.",
+)
+async def create_ticket(
+  user_id: str,
+  reason: str,
+  transaction_id: str | None = None,
+  idempotency_key: str | None = None,
+) -> dict[str, Any]:
+  return await WORKFLOW.create(user_id, reason, transaction_id, idempotency_key)
+
+
+@server.tool(
+  name="update_ticket_status",
+  description=(
+    "Move a ticket through new -> in_progress -> pending_customer -> resolved -> closed. "
+    "Pass expected_version from the last read to reject stale updates."
+  ),
+)
+async def update_ticket_status(
+  ticket_id: str,
+  status: TicketStatus,
+  expected_version: int | None = None,
+  note: str | None = None,
+  idempotency_key: str | None = None,
+) -> dict[str, Any]:
+  return await WORKFLOW.transition(ticket_id, status, expected_version, note, idempotency_key)
+
+
+@server.tool(name="get_ticket_events", description="Return the ordered change history for a ticket.")
+async def get_ticket_events(ticket_id: str) -> dict[str, Any]:
+  WORKFLOW.get(ticket_id)
+  return {"ticket_id": ticket_id, "events": WORKFLOW.history(ticket_id)}
 
 
 @server.tool(name="get_ticket_status", description="Fetch tickets for a user.")
 async def get_ticket_status(user_id: str) -> dict[str, Any]:
-  items = [ticket for ticket in TICKETS.values() if ticket["user_id"] == user_id]
-  return {"user_id": user_id, "tickets": items}
+  tickets = WORKFLOW.for_user(user_id)
+  if SYNTHETIC is not None:
+    # Generated tickets overlaid with any the workflow has changed, then tickets created in-session.
+    changed = {ticket["id"]: ticket for ticket in tickets}
+    generated = [changed.pop(ticket["id"], ticket) for ticket in synthetic_tickets(user_id, SYNTHETIC, _SYNTHETIC_ANCHOR)]
+    tickets = generated + list(changed.values())
+  return {"user_id": user_id, "tickets": tickets}
+
+
+configure_synthetic(SyntheticConfig.from_env())
 
 
 if __name__ == "__main__":
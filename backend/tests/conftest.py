@@ -20,6 +20,7 @@ os.environ.setdefault("OPENAI_API_KEY", "test-key")
 os.environ.setdefault("AGNO_MODEL_ID", "gpt-5-mini")
 
 from app.main import app  # noqa: E402
+from agent.prompts import build_instructions  # noqa: E402
 
 
 @app.get("/__test/token")
@@ -27,6 +28,17 @@ def read_token(request: Request):
   return {"token": getattr(request.state, "mobile_token", None)}
 
 
+@app.get("/__test/session")
+def read_session(request: Request):
+  session = getattr(request.state, "session", None)
+  return {"session": session.model_dump(mode="json") if session else None}
+
+
+@app.get("/__test/instructions")
+def read_instructions():
+  return {"instructions": build_instructions()}
+
+
 @pytest.fixture(scope="session")
 def client() -> TestClient:
   return TestClient(app)
@@ -1,3 +1,4 @@
+import asyncio
 import importlib.util
 from pathlib import Path
 
@@ -24,3 +25,269 @@ async def test_dummy_mcp_ticket_status():
   assert result["user_id"] == "retail-123"
   assert isinstance(result["tickets"], list)
 
+
+@pytest.fixture
+def synthetic():
+  config = wallet_server.SyntheticConfig(users=4, transactions_per_user=500, tickets_per_user=3, max_cached_users=2)
+  wallet_server.configure_synthetic(config)
+  yield config
+  wallet_server.configure_synthetic(None)
+
+
+@pytest.mark.asyncio
+async def test_dummy_mcp_new_users_do_not_share_fixtures():
+  await wallet_server.get_balances.fn("retail-new")
+  assert wallet_server.BASE_BALANCES["retail-new"] is not wallet_server.BASE_BALANCES["retail-123"]
+  assert wallet_server.BASE_TRANSACTIONS["retail-new"] is not wallet_server.BASE_TRANSACTIONS["retail-123"]
+
+
+@pytest.mark.asyncio
+async def test_synthetic_pagination_covers_ledger(synthetic):
+  user_id = wallet_server.synthetic_user_id(0)
+  seen, cursor = [], None
+  while True:
+    page = await wallet_server.get_transactions.fn(user_id, limit=128, cursor=cursor)
+    seen.extend(txn["id"] for txn in page["transactions"])
+    cursor = page["next_cursor"]
+    if cursor is None:
+      break
+  assert len(seen) == len(set(seen)) == synthetic.transactions_per_user
+
+
+@pytest.mark.asyncio
+async def test_synthetic_filters_and_determinism(synthetic):
+  user_id = wallet_server.synthetic_user_id(1)
+  page = await wallet_server.get_transactions.fn(user_id, limit=20, status="completed", direction="outflow")
+  assert page["transactions"]
+  assert all(t["status"] == "completed" and t["amount"] < 0 for t in page["transactions"])
+
+  # Touch other users so the ledger is evicted, then check it regenerates identically.
+  for index in (2, 3):
+    await wallet_server.get_transactions.fn(wallet_server.synthetic_user_id(index))
+  assert user_id not in wallet_server._LEDGERS
+  again = await wallet_server.get_transactions.fn(user_id, limit=20, status="completed", direction="outflow")
+  assert again == page
+
+
+@pytest.mark.asyncio
+async def test_synthetic_mode_keeps_module_state_bounded(synthetic):
+  before = len(wallet_server.BASE_BALANCES), len(wallet_server.BASE_TRANSACTIONS)
+  for index in range(10):
+    user_id = wallet_server.synthetic_user_id(index)
+    await wallet_server.get_transactions.fn(user_id)
+    balances = await wallet_server.get_balances.fn(user_id)
+    assert balances["accounts"][0]["balance"] > 0
+  assert (len(wallet_server.BASE_BALANCES), len(wallet_server.BASE_TRANSACTIONS)) == before
+  assert len(wallet_server._LEDGERS) <= synthetic.max_cached_users
+  assert await wallet_server.get_balances.fn(user_id) == balances
+
+
+def test_synthetic_cache_respects_row_cap():
+  wallet_server.configure_synthetic(
+    wallet_server.SyntheticConfig(transactions_per_user=100, max_cached_users=50, max_cached_rows=250)
+  )
+  try:
+    for index in range(10):
+      wallet_server._ledger(wallet_server.synthetic_user_id(index))
+    assert len(wallet_server._LEDGERS) == 2
+    assert wallet_server._cached_rows == 200
+  finally:
+    wallet_server.configure_synthetic(None)
+
+
+def test_synthetic_config_from_env_defaults(monkeypatch):
+  for name in ("USERS", "TXNS_PER_USER", "TICKETS_PER_USER", "SEED", "MAX_CACHED_USERS", "PRELOAD"):
+    monkeypatch.delenv(f"ECO_MCP_SYNTHETIC_{name}", raising=False)
+  monkeypatch.setenv("ECO_MCP_SYNTHETIC", "true")
+  assert wallet_server.SyntheticConfig.from_env() == wallet_server.SyntheticConfig()
+
+  monkeypatch.setenv("ECO_MCP_SYNTHETIC_USERS", "7")
+  assert wallet_server.SyntheticConfig.from_env().users == 7
+
+
+@pytest.fixture(params=["fixtures", "synthetic"])
+def data_mode(request):
+  if request.param == "synthetic":
+    wallet_server.configure_synthetic(wallet_server.SyntheticConfig(transactions_per_user=50, max_cached_users=2))
+  yield request.param
+  wallet_server.configure_synthetic(None)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("cursor", ["abc", "-2", "1.5"])
+async def test_transactions_reject_bad_cursor(data_mode, cursor):
+  with pytest.raises(wallet_server.ToolError):
+    await wallet_server.get_transactions.fn("retail-123", cursor=cursor)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("filters", [{"status": "lost"}, {"category": "gambling"}, {"direction": "bogus"}])
+async def test_transactions_reject_unknown_filters(data_mode, filters):
+  with pytest.raises(wallet_server.ToolError):
+    await wallet_server.get_transactions.fn("retail-123", **filters)
+
+
+def test_transaction_filters_are_schema_enums():
+  props = wallet_server.get_transactions.parameters["properties"]
+  for name, allowed in (
+    ("status", wallet_server.TXN_STATUSES),
+    ("category", wallet_server.TXN_CATEGORIES),
+    ("direction", wallet_server.TXN_DIRECTIONS),
+  ):
+    assert {"enum": list(allowed), "type": "string"} in props[name]["anyOf"]
+
+
+@pytest.mark.asyncio
+async def test_synthetic_tickets(synthetic):
+  result = await wallet_server.get_ticket_status.fn(wallet_server.synthetic_user_id(0))
+  assert len(result["tickets"]) == synthetic.tickets_per_user
+
+
+@pytest.fixture
+def workflow(monkeypatch):
+  async def yield_to_loop(event):
+    # Force a context switch inside every critical section to surface races.
+    await asyncio.sleep(0)
+
+  fresh = wallet_server.TicketWorkflow(sink=yield_to_loop, resolver=wallet_server._synthetic_ticket)
+  monkeypatch.setattr(wallet_server, "WORKFLOW", fresh)
+  return fresh
+
+
+@pytest.mark.asyncio
+async def test_ticket_workflow_transitions(workflow):
+  ticket = await wallet_server.create_ticket.fn("retail-123", "Refund missing")
+  assert ticket["status"] == "new" and ticket["version"] == 1
+
+  ticket = await wallet_server.update_ticket_status.fn(ticket["id"], "in_progress", expected_version=1)
+  assert ticket["version"] == 2
+
+  with pytest.raises(wallet_server.TicketWorkflowError) as exc:
+    await wallet_server.update_ticket_status.fn(ticket["id"], "closed")
+  assert exc.value.code == "invalid_transition"
+
+  with pytest.raises(wallet_server.TicketWorkflowError) as exc:
+    await wallet_server.update_ticket_status.fn(ticket["id"], "resolved", expected_version=1)
+  assert exc.value.code == "version_conflict"
+
+  events = (await wallet_server.get_ticket_events.fn(ticket["id"]))["events"]
+  assert [(e["from_status"], e["to_status"]) for e in events] == [(None, "new"), ("new", "in_progress")]
+
+
+@pytest.mark.asyncio
+async def test_ticket_workflow_concurrent_stress(workflow):
+  users = [f"user-{i}" for i in range(20)]
+
+  # 3000 creates, each idempotency key submitted three times concurrently.
+  creates = [
+    wallet_server.create_ticket.fn(users[i % len(users)], f"Issue {i}", idempotency_key=f"req-{i}")
+    for i in range(1000)
+    for _ in range(3)
+  ]
+  created = await asyncio.gather(*creates)
+  assert len(workflow.tickets) == 1000
+  assert len({ticket["id"] for ticket in created}) == 1000
+
+  # 2000 racing updates against 10 tickets, all claiming version 1: exactly one wins per ticket.
+  targets = list(workflow.tickets)[:10]
+  updates = [
+    wallet_server.update_ticket_status.fn(targets[i % len(targets)], "in_progress", expected_version=1)
+    for i in range(2000)
+  ]
+  results = await asyncio.gather(*updates, return_exceptions=True)
+  winners = [r for r in results if isinstance(r, dict)]
+  assert len(winners) == len(targets)
+  assert all(
+    isinstance(r, wallet_server.TicketWorkflowError) and r.code == "version_conflict"
+    for r in results
+    if not isinstance(r, dict)
+  )
+
+  # Retries with the same idempotency key apply once.
+  retries = [
+    wallet_server.update_ticket_status.fn(targets[0], "pending_customer", idempotency_key="move-1")
+    for _ in range(500)
+  ]
+  assert {r["version"] for r in await asyncio.gather(*retries)} == {3}
+
+  seqs = [event["seq"] for event in workflow.events]
+  assert seqs == sorted(seqs) and len(seqs) == len(set(seqs))
+  for ticket_id in targets:
+    versions = [event["version"] for event in workflow.history(ticket_id)]
+    assert versions == list(range(1, workflow.tickets[ticket_id]["version"] + 1))
+
+
+@pytest.mark.asyncio
+async def test_ticket_idempotency_key_mismatch(workflow):
+  ticket = await wallet_server.create_ticket.fn("retail-123", "Refund missing", idempotency_key="k1")
+  assert (await wallet_server.create_ticket.fn("retail-123", "Refund missing", idempotency_key="k1")) == ticket
+  with pytest.raises(wallet_server.TicketWorkflowError) as exc:
+    await wallet_server.create_ticket.fn("retail-123", "Different reason", idempotency_key="k1")
+  assert exc.value.code == "idempotency_mismatch"
+
+  await wallet_server.update_ticket_status.fn(ticket["id"], "in_progress", idempotency_key="u1")
+  with pytest.raises(wallet_server.TicketWorkflowError) as exc:
+    await wallet_server.update_ticket_status.fn(ticket["id"], "closed", idempotency_key="u1")
+  assert exc.value.code == "idempotency_mismatch"
+  assert not workflow._pending
+
+
+@pytest.mark.asyncio
+async def test_ticket_idempotency_results_are_bounded(monkeypatch):
+  bounded = wallet_server.TicketWorkflow(max_idempotency_keys=5)
+  monkeypatch.setattr(wallet_server, "WORKFLOW", bounded)
+  for i in range(20):
+    await wallet_server.create_ticket.fn("retail-123", f"Issue {i}", idempotency_key=f"k{i}")
+  assert len(bounded._results) == 5
+  assert not bounded._pending
+
+
+@pytest.mark.asyncio
+async def test_synthetic_tickets_join_workflow(synthetic, workflow):
+  listed = (await wallet_server.get_ticket_status.fn(wallet_server.synthetic_user_id(0)))["tickets"]
+  ticket = next(t for t in listed if wallet_server.TICKET_TRANSITIONS[t["status"]])
+  events = (await wallet_server.get_ticket_events.fn(ticket["id"]))["events"]
+  assert [e["type"] for e in events] == ["created"]
+
+  target = sorted(wallet_server.TICKET_TRANSITIONS[ticket["status"]])[0]
+  updated = await wallet_server.update_ticket_status.fn(ticket["id"], target, expected_version=1)
+  assert updated["version"] == 2
+
+  # Only the changed ticket is stored; listing overlays it on the generated ones.
+  assert list(workflow.tickets) == [ticket["id"]]
+  relisted = (await wallet_server.get_ticket_status.fn(wallet_server.synthetic_user_id(0)))["tickets"]
+  assert [t["id"] for t in relisted] == [t["id"] for t in listed]
+  assert next(t for t in relisted if t["id"] == ticket["id"])["version"] == 2
+
+  # Ids for users that were never listed resolve without building their ledger.
+  unseen = f"TCK-{wallet_server.synthetic_user_id(3)}-0000"
+  assert (await wallet_server.get_ticket_events.fn(unseen))["events"]
+  assert wallet_server.synthetic_user_id(3) not in wallet_server._LEDGERS
+
+
+@pytest.mark.asyncio
+async def test_synthetic_reads_do_not_grow_workflow(synthetic, workflow):
+  for index in range(synthetic.users):
+    for ticket in (await wallet_server.get_ticket_status.fn(wallet_server.synthetic_user_id(index)))["tickets"]:
+      await wallet_server.get_ticket_events.fn(ticket["id"])
+  assert not workflow.tickets and not workflow.events
+  assert not wallet_server._LEDGERS
+
+
+@pytest.mark.asyncio
+async def test_adopted_tickets_are_bounded_and_reset(synthetic, workflow):
+  workflow.max_adopted = 2
+  user_id = wallet_server.synthetic_user_id(1)
+  changed = []
+  for ticket in wallet_server.synthetic_tickets(user_id, synthetic, wallet_server._SYNTHETIC_ANCHOR):
+    if wallet_server.TICKET_TRANSITIONS[ticket["status"]]:
+      target = sorted(wallet_server.TICKET_TRANSITIONS[ticket["status"]])[0]
+      changed.append((await workflow.transition(ticket["id"], target))["id"])
+  assert len(changed) > 2
+  assert list(workflow.tickets) == changed[-2:]
+  assert set(workflow._history) == set(workflow.tickets)
+
+  created = await workflow.create(user_id, "Fresh issue")
+  workflow.forget_adopted()
+  assert list(workflow.tickets) == [created["id"]]
+  assert [t["id"] for t in workflow.for_user(user_id)] == [created["id"]]
@@ -0,0 +1,45 @@
+from datetime import datetime, timezone
+
+from agno.run.base import RunContext
+from agno.tools.function import Function
+
+from agent import prompts
+from agent.tools import frontend_actions
+
+
+def _fresh_render_widget() -> Function:
+  return Function(name="render_widget", entrypoint=frontend_actions.render_widget.entrypoint)
+
+
+def test_tool_schema_is_canonical_and_stable():
+  first = prompts.stabilize_tool_schema(_fresh_render_widget())
+  second = prompts.stabilize_tool_schema(_fresh_render_widget())
+  assert first is not second
+  assert prompts.canonical_json(first.parameters) == prompts.canonical_json(second.parameters)
+  assert list(first.parameters) == sorted(first.parameters)
+  assert first.skip_entrypoint_processing
+
+
+def test_instructions_put_session_context_last():
+  run_context = RunContext(run_id="run-1", session_id="sess-1", user_id="retail-123")
+  text = prompts.build_instructions(run_context)
+  assert text.startswith(prompts.STATIC_INSTRUCTIONS)
+  assert text.endswith("</session_context>")
+  assert "retail-123" in text and "sess-1" in text
+
+
+def test_session_context_uses_supplied_date():
+  context = prompts.build_session_context(now=datetime(2025, 1, 2, tzinfo=timezone.utc))
+  assert "2025-01-02" in context
+  assert "user id" not in context
+
+
+def test_count_tokens_falls_back_when_encoding_unavailable(monkeypatch):
+  import sys
+  import types
+
+  def fail(name):
+    raise OSError("no network")
+
+  monkeypatch.setitem(sys.modules, "tiktoken", types.SimpleNamespace(get_encoding=fail))
+  assert prompts.count_tokens("abcdefgh") == 2
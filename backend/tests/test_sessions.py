@@ -0,0 +1,128 @@
+import time
+from datetime import datetime, timedelta, timezone
+
+import jwt
+from pymongo.errors import DuplicateKeyError
+
+from app.schemas import SessionContext, SessionStartRequest
+from app.sessions import InMemorySessionStore, MongoSessionStore, SessionCache, SessionService, hash_token
+
+
+def _service(maxsize: int = 8) -> SessionService:
+  return SessionService(InMemorySessionStore(), SessionCache(maxsize=maxsize), ttl=timedelta(minutes=30))
+
+
+def test_session_start_and_resume(client, auth_header):
+  token = auth_header["Authorization"].split(" ", 1)[1]
+  first = client.post("/session/start", json={"mobileToken": token, "metadata": {"channel": "test"}})
+  assert first.status_code == 200
+  body = first.json()
+  assert body["userId"] == "user-test"
+
+  again = client.post("/session/start", json={"mobileToken": token})
+  assert again.json()["sessionId"] == body["sessionId"]
+
+  resp = client.get("/__test/session", headers=auth_header)
+  assert resp.json()["session"]["sessionId"] == body["sessionId"]
+
+
+def test_unknown_token_has_no_session(client):
+  resp = client.get("/__test/session", headers={"Authorization": "Bearer not-a-session"})
+  assert resp.json()["session"] is None
+
+
+def test_resolve_served_from_cache():
+  service = _service()
+  session = service.start(SessionStartRequest(mobileToken="opaque", metadata={"userId": "retail-123"}))
+  assert session.userId == "retail-123"
+
+  service.store = None  # any store access would now fail
+  assert service.resolve("opaque") == session
+
+
+def test_cache_evicts_lru_and_expired():
+  cache = SessionCache(maxsize=2)
+  now = datetime.now(timezone.utc)
+  live = SessionContext(sessionId="s", userId="u", expiresAt=now + timedelta(minutes=5))
+  cache.put("a", live)
+  cache.put("b", live)
+  cache.get("a")
+  cache.put("c", live)
+  assert cache.get("b") is None and cache.get("a") == live
+
+  cache.put("old", SessionContext(sessionId="s", userId="u", expiresAt=now - timedelta(seconds=1)))
+  assert cache.get("old") is None
+
+
+def test_token_is_stored_hashed():
+  service = _service()
+  service.start(SessionStartRequest(mobileToken="secret-token"))
+  assert service.store.find(hash_token("secret-token")) is not None
+  assert service.store.find("secret-token") is None
+
+
+def test_expired_token_is_rejected(client):
+  token = jwt.encode({"sub": "user-test", "exp": int(time.time()) - 60}, "test-secret", algorithm="HS256")
+  resp = client.post("/session/start", json={"mobileToken": token})
+  assert resp.status_code == 401
+
+
+class CountingStore(InMemorySessionStore):
+  def __init__(self):
+    super().__init__()
+    self.finds = 0
+
+  def find(self, token_hash):
+    self.finds += 1
+    return super().find(token_hash)
+
+
+def test_unknown_token_lookup_is_cached():
+  service = SessionService(CountingStore(), SessionCache(), ttl=timedelta(minutes=30))
+  assert service.resolve("unknown") is None
+  assert service.resolve("unknown") is None
+  assert service.known_miss("unknown")
+  assert service.store.finds == 1
+
+  service.start(SessionStartRequest(mobileToken="unknown"))
+  assert not service.known_miss("unknown")
+  assert service.resolve("unknown") is not None
+
+
+def test_middleware_session_reaches_agent_instructions(client):
+  token = jwt.encode({"sub": "retail-777", "exp": int(time.time()) + 600}, "test-secret", algorithm="HS256")
+  metadata = {"preferences": {"language": "sn"}}
+  assert client.post("/session/start", json={"mobileToken": token, "metadata": metadata}).status_code == 200
+
+  resp = client.get("/__test/instructions", headers={"Authorization": f"Bearer {token}"})
+  text = resp.json()["instructions"]
+  assert "Customer user id: retail-777" in text
+  assert '"language":"sn"' in text
+
+  anonymous = client.get("/__test/instructions").json()["instructions"]
+  assert "retail-777" not in anonymous
+
+
+class FakeCollection:
+  def __init__(self):
+    self.indexes = []
+    self.calls = 0
+
+  def create_index(self, key, **kwargs):
+    self.indexes.append((key, kwargs))
+
+  def find_one_and_update(self, query, update, upsert=False, return_document=None):
+    self.calls += 1
+    if upsert:
+      raise DuplicateKeyError("E11000 duplicate key")
+    return {"tokenHash": query["tokenHash"], "sessionId": "sess_existing"}
+
+
+def test_mongo_store_indexes_and_duplicate_retry():
+  collection = FakeCollection()
+  store = MongoSessionStore(collection)
+  assert ("tokenHash", {"unique": True}) in collection.indexes
+  assert ("expiresAt", {"expireAfterSeconds": 0}) in collection.indexes
+
+  doc = store.upsert("hash", {"userId": "u"}, {"sessionId": "sess_new"})
+  assert doc["sessionId"] == "sess_existing" and collection.calls == 2
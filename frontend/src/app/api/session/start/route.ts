@@ -0,0 +1,18 @@
+import { NextRequest, NextResponse } from "next/server";
+
+const backendUrl =
+  process.env.BACKEND_URL ?? process.env.NEXT_PUBLIC_BACKEND_URL ?? "http://localhost:8000";
+
+// Same-origin proxy so the browser never calls the backend cross-origin (CORS is closed outside development).
+export const POST = async (req: NextRequest) => {
+  const response = await fetch(`${backendUrl}/session/start`, {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: await req.text(),
+  });
+
+  return new NextResponse(await response.text(), {
+    status: response.status,
+    headers: { "Content-Type": response.headers.get("Content-Type") ?? "application/json" },
+  });
+};
@@ -30,6 +30,46 @@ function decodeJwt(token: string): Record<string, unknown> {
   }
 }
 
+class SessionRejectedError extends Error {}
+
+type ReadySession = { sessionId: string; expiresAt: string; userId: string };
+
+async function startSession(
+  mobileToken: string,
+  metadata?: Record<string, unknown>,
+): Promise<ReadySession> {
+  const response = await fetch("/api/session/start", {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify({ mobileToken, metadata }),
+  });
+  if (response.status === 401) {
+    throw new SessionRejectedError("Your session has expired. Please reopen Eco Assist.");
+  }
+  if (!response.ok) {
+    throw new Error(`Session start failed (${response.status})`);
+  }
+  const body = (await response.json()) as ReadySession;
+  return { sessionId: body.sessionId, expiresAt: body.expiresAt, userId: body.userId };
+}
+
+// Fallback when the backend is unreachable: derive the session from the token client-side.
+function localSession(mobileToken: string, metadata?: Record<string, unknown>): ReadySession {
+  const payload = decodeJwt(mobileToken);
+  const userId =
+    (typeof payload.sub === "string" && payload.sub.length > 0 ? payload.sub : undefined) ??
+    (metadata && typeof metadata.userId === "string" ? metadata.userId : "eco-user");
+  const expiresAt =
+    typeof payload.exp === "number"
+      ? new Date(payload.exp * 1000).toISOString()
+      : new Date(Date.now() + 30 * 60 * 1000).toISOString();
+  const sessionId =
+    typeof window !== "undefined" && window.crypto?.randomUUID
+      ? window.crypto.randomUUID()
+      : `sess_${Date.now()}`;
+  return { sessionId, expiresAt, userId };
+}
+
 export function useSessionBootstrap(params: {
   mobileToken?: string;
   metadata?: Record<string, unknown>;
@@ -42,35 +82,31 @@ export function useSessionBootstrap(params: {
       return;
     }
 
+    const mobileToken = params.mobileToken;
+    let cancelled = false;
     setState({ status: "loading" });
-    try {
-      const payload = decodeJwt(params.mobileToken);
-      const userId =
-        (typeof payload.sub === "string" && payload.sub.length > 0 ? payload.sub : undefined) ??
-        (params.metadata && typeof params.metadata.userId === "string"
-          ? params.metadata.userId
-          : "eco-user");
-      const expires =
-        typeof payload.exp === "number"
-          ? new Date(payload.exp * 1000).toISOString()
-          : new Date(Date.now() + 30 * 60 * 1000).toISOString();
-      const sessionId =
-        typeof window !== "undefined" && window.crypto?.randomUUID
-          ? window.crypto.randomUUID()
-          : `sess_${Date.now()}`;
 
-      setState({
-        status: "ready",
-        sessionId,
-        expiresAt: expires,
-        userId,
-      });
-    } catch (error) {
-      setState({
-        status: "error",
-        error: error instanceof Error ? error.message : "Failed to parse mobile token",
+    startSession(mobileToken, params.metadata)
+      .catch(error => {
+        if (error instanceof SessionRejectedError) throw error;
+        console.warn("[session] backend bootstrap failed; using client-side session", error);
+        return localSession(mobileToken, params.metadata);
+      })
+      .then(session => {
+        if (!cancelled) setState({ status: "ready", ...session });
+      })
+      .catch(error => {
+        if (!cancelled) {
+          setState({
+            status: "error",
+            error: error instanceof Error ? error.message : "Failed to parse mobile token",
+          });
+        }
       });
-    }
+
+    return () => {
+      cancelled = true;
+    };
   }, [params.mobileToken, params.metadata]);
 
   return state;